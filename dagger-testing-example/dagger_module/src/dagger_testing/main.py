@@ -5,10 +5,20 @@ focusing on simplicity and reliability as guiding principles.
 """
 
 import asyncio
+import functools
 
 import dagger as dg
 from dagger import dag, function, object_type
 
+# Base images per supported Python version. Pinned to an explicit uv release
+# so the image reference, and with it Dagger's cache key, stays stable.
+# Append "@sha256:<digest>" to pin fully; see the README for refreshing them.
+PYTHON_IMAGES = {
+    "3.10": "ghcr.io/astral-sh/uv:0.13.0-python3.10-alpine",
+    "3.11": "ghcr.io/astral-sh/uv:0.13.0-python3.11-alpine",
+    "3.12": "ghcr.io/astral-sh/uv:0.13.0-python3.12-alpine",
+}
+
 
 @object_type
 class DaggerTestingExample:
@@ -21,31 +31,103 @@ class DaggerTestingExample:
     - Service binding patterns for integration testing
     """
 
+    @functools.cached_property
+    def _uv_cache(self) -> dg.CacheVolume:
+        """Shared uv cache volume, resolved once."""
+        return dag.cache_volume("uv")
+
+    @functools.cached_property
+    def _base_containers(self) -> dict[str, dg.Container]:
+        """Base containers, keyed by Python version."""
+        return {}
+
     # Base container creation
+    def _base_container(self, python_version: str = "3.12") -> dg.Container:
+        """Create a container with uv and its cache mounted, without source.
+
+        The container is built once per Python version and reused, so every
+        caller shares the same prefix of the operation graph.
+        """
+        if python_version not in PYTHON_IMAGES:
+            supported = ", ".join(PYTHON_IMAGES)
+            raise ValueError(
+                f"Unsupported Python version {python_version!r} "
+                f"(supported: {supported})"
+            )
+
+        if python_version not in self._base_containers:
+            self._base_containers[python_version] = (
+                dag.container()
+                .from_(PYTHON_IMAGES[python_version])
+                .with_mounted_cache("/root/.cache/uv", self._uv_cache)
+                .with_workdir("/app")
+                .with_env_variable("UV_LINK_MODE", "copy")
+                .with_env_variable("PATH", "/app/.venv/bin:$PATH", expand=True)
+            )
+        return self._base_containers[python_version]
+
+    def _deps_container(
+        self, source: dg.Directory, python_version: str = "3.12"
+    ) -> dg.Container:
+        """Install locked project and test dependencies from the manifest only.
+
+        Only pyproject.toml and uv.lock are copied in before syncing, so this
+        layer stays cached until the dependencies change, not on every source
+        edit. The project itself is installed later, once the source is present.
+        """
+        return (
+            self._base_container(python_version)
+            .with_file("/app/pyproject.toml", source.file("pyproject.toml"))
+            .with_file("/app/uv.lock", source.file("uv.lock"))
+            .with_exec(
+                [
+                    "uv",
+                    "sync",
+                    "--frozen",
+                    "--no-install-project",
+                    "--extra",
+                    "test",
+                ]
+            )
+        )
+
     @function
     def test_container(
         self, source: dg.Directory, python_version: str = "3.12"
     ) -> dg.Container:
-        """Create a base container with uv and source code.
+        """Create a base container with uv, dependencies and source code.
 
         Args:
             source: Directory containing the source code
             python_version: Python version to use (default: 3.12)
 
         Returns:
-            Container configured with uv and source code
+            Container configured with uv, dependencies, source code and a
+            pytest cache persisted per Python version
         """
-        uv_cache = dag.cache_volume("uv")
-
         return (
-            dag.container()
-            .from_(f"ghcr.io/astral-sh/uv:python{python_version}-bookworm-slim")
-            .with_mounted_cache("/root/.cache/uv", uv_cache)
-            .with_directory("/app", source)
-            .with_workdir("/app")
-            .with_env_variable("UV_SYSTEM_PYTHON", "1")
+            self._deps_container(source, python_version)
+            .with_directory("/app", source, exclude=[".venv"])
+            .with_mounted_cache(
+                "/app/.pytest_cache", dag.cache_volume(f"pytest-{python_version}")
+            )
         )
 
+    def _pytest_command(self, *args: str) -> list[str]:
+        """Build one exec that installs the project and then runs pytest.
+
+        The project sync only adds the source on top of the cached dependency
+        layer, so it is fused with the test run rather than kept as its own
+        layer. Arguments are passed positionally, never interpolated.
+        """
+        return [
+            "sh",
+            "-c",
+            'uv sync --frozen --extra test && exec pytest "$@"',
+            "sh",
+            *args,
+        ]
+
     # Unit testing functions
     @function
     async def unit_test(
@@ -62,8 +144,7 @@ class DaggerTestingExample:
         """
         return await (
             self.test_container(source, python_version)
-            .with_exec(["uv", "pip", "install", "-e", ".[test]"])
-            .with_exec(["pytest", "tests/unit", "-v", "--tb=short"])
+            .with_exec(self._pytest_command("tests/unit", "-v", "--tb=short"))
             .stdout()
         )
 
@@ -80,23 +161,30 @@ class DaggerTestingExample:
         Returns:
             Formatted test results for all versions
         """
-        version_list = [v.strip() for v in versions.split(",")]
-
-        async def test_version(version: str) -> tuple[str, str]:
-            """Test a specific Python version."""
-            try:
-                result = await self.unit_tests(source, version)
-                return version, f"Python {version}: PASSED\n{result}"
-            except Exception as e:
-                return version, f"Python {version}: FAILED\n{str(e)}"
-
-        # Run all versions concurrently
-        results = await asyncio.gather(*[test_version(v) for v in version_list])
+        # Normalize once: drop blanks and duplicates, reject empty or unknown input
+        requested = {v.strip() for v in versions.split(",") if v.strip()}
+        if not requested:
+            raise ValueError("No Python versions given")
+        unsupported = requested.difference(PYTHON_IMAGES)
+        if unsupported:
+            raise ValueError(
+                f"Unsupported Python versions: {', '.join(sorted(unsupported))} "
+                f"(supported: {', '.join(PYTHON_IMAGES)})"
+            )
+        version_list = [v for v in PYTHON_IMAGES if v in requested]
+
+        # Run all versions concurrently, collecting failures as results
+        results = await asyncio.gather(
+            *[self.unit_test(source, v) for v in version_list],
+            return_exceptions=True,
+        )
 
         # Format results
+        separator = "=" * 50
         output_lines = ["=== MULTI-VERSION TEST RESULTS ===", ""]
-        for _, result in results:
-            output_lines.extend([result, "=" * 50, ""])
+        for version, result in zip(version_list, results):
+            status = "FAILED" if isinstance(result, BaseException) else "PASSED"
+            output_lines += [f"Python {version}: {status}\n{result}", separator, ""]
 
         return "\n".join(output_lines)
 
@@ -116,8 +204,7 @@ class DaggerTestingExample:
         """
         return await (
             self.test_container(source, python_version)
-            .with_exec(["uv", "pip", "install", "-e", ".[test]"])
-            .with_exec(["pytest", path, "-v", "--tb=short"])
+            .with_exec(self._pytest_command(path, "-v", "--tb=short"))
             .stdout()
         )
 
@@ -130,7 +217,8 @@ class DaggerTestingExample:
 
         This function demonstrates how to:
         1. Build a container with the FastAPI application
-        2. Install dependencies using uv
+        2. Install the project on top of the cached dependency layer,
+           leaving the already-synced test extra in place
         3. Expose the service on port 8000
         4. Return it as a Dagger service for binding
 
@@ -146,11 +234,20 @@ class DaggerTestingExample:
         """
         return (
             self.test_container(source, python_version)
-            .with_exec(["uv", "pip", "install", "-e", "."])
+            .with_exec(["uv", "sync", "--frozen", "--no-dev", "--inexact"])
             .with_exposed_port(8000)
             .as_service(args=["python", "-m", "hello_world"])
         )
 
+    @functools.cached_property
+    def _curl_client(self) -> dg.Container:
+        """Alpine container with curl and jq, built once and reused."""
+        return (
+            dag.container()
+            .from_("alpine:3.20")
+            .with_exec(["apk", "add", "--no-cache", "curl", "jq"])
+        )
+
     @function
     async def test_api_service(
         self, source: dg.Directory, python_version: str = "3.12"
@@ -158,7 +255,7 @@ class DaggerTestingExample:
         """Test the API service by sending HTTP requests.
 
         This function demonstrates a complete service testing pattern:
-        1. Start the FastAPI service using api_service()
+        1. Start the FastAPI service explicitly using api_service()
         2. Bind it to a test container with alias 'api'
         3. Send HTTP requests to verify functionality
         4. Return formatted test results
@@ -173,35 +270,21 @@ class DaggerTestingExample:
         Returns:
             Test results showing API responses
         """
-        # Create the API service
-        api_svc = self.api_service(source, python_version)
-
-        # Create a test client container
-        test_client = (
-            dag.container()
-            .from_("alpine:latest")
-            .with_exec(["apk", "add", "--no-cache", "curl", "jq"])
-            .with_service_binding("api", api_svc)
-        )
+        # Start the API service before binding it
+        api_svc = await self.api_service(source, python_version).start()
 
-        # Test the root endpoint
-        root_response = await test_client.with_exec(
-            ["curl", "-s", "http://api:8000/"]
-        ).stdout()
+        # Bind the service to the shared test client container
+        test_client = self._curl_client.with_service_binding("api", api_svc)
 
-        # Test the health endpoint
-        health_response = await test_client.with_exec(
-            ["curl", "-s", "http://api:8000/health"]
+        # Query and pretty-print both endpoints concurrently, one exec each.
+        # pipefail makes an HTTP error from curl -f fail the exec.
+        root_co = test_client.with_exec(
+            ["sh", "-c", "set -o pipefail; curl -fsS http://api:8000/ | jq ."]
         ).stdout()
-
-        # Format pretty JSON output
-        root_pretty = await test_client.with_exec(
-            ["sh", "-c", f"echo '{root_response}' | jq ."]
-        ).stdout()
-
-        health_pretty = await test_client.with_exec(
-            ["sh", "-c", f"echo '{health_response}' | jq ."]
+        health_co = test_client.with_exec(
+            ["sh", "-c", "set -o pipefail; curl -fsS http://api:8000/health | jq ."]
         ).stdout()
+        root_pretty, health_pretty = await asyncio.gather(root_co, health_co)
 
         # Build result string
         result_lines = [
@@ -239,15 +322,21 @@ class DaggerTestingExample:
         Returns:
             Integration test results from pytest
         """
-        # Start the API service
-        api_svc = self.api_service(source, python_version)
+        # Start the API service before binding it
+        api_svc = await self.api_service(source, python_version).start()
 
-        # Run integration tests with the API service bound
-        return await (
+        # Run integration tests with the API service bound. sync() executes
+        # the tests while their output streams to the Dagger console, then
+        # the finished output is read back from the completed container.
+        test_run = await (
             self.test_container(source, python_version)
             .with_service_binding("api", api_svc)
             .with_env_variable("API_BASE_URL", "http://api:8000")
-            .with_exec(["uv", "pip", "install", "-e", ".[test]"])
-            .with_exec(["pytest", "tests/e2e", "-v", "--tb=short"])
-            .stdout()
+            .with_exec(
+                self._pytest_command(
+                    "tests/e2e", "-n", "auto", "--dist=loadfile", "-v", "--tb=short"
+                )
+            )
+            .sync()
         )
+        return await test_run.stdout()
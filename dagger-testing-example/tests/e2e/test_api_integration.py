@@ -8,6 +8,9 @@ import os
 import pytest
 import requests
 
+# Fail fast on connect if the service isn't up, allow longer for the response
+TIMEOUT = (0.2, 1.0)
+
 
 @pytest.fixture
 def api_url():
@@ -15,8 +18,16 @@ def api_url():
     return os.environ.get("API_BASE_URL", "http://localhost:8000")
 
 
-def test_hello_world(api_url):
+@pytest.fixture(scope="session")
+def session():
+    """Share one HTTP session so connections are kept alive between tests."""
+    s = requests.Session()
+    yield s
+    s.close()
+
+
+def test_hello_world(api_url, session):
     """Test that service returns Hello, World!"""
-    response = requests.get(api_url, timeout=1)
+    response = session.get(api_url, timeout=TIMEOUT)
     assert response.status_code == 200
     assert response.json() == {"message": "Hello, World!"}
@@ -13,11 +13,11 @@ from fastapi.testclient import TestClient
 from src.hello_world import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
     """
-    Create isolated test client for each test.
-    Ensures no test interdependencies.
+    Create a test client shared across the session.
+    Safe because tests only read from the app and never mutate its state.
     """
     return TestClient(app)
 